@@ -6,6 +6,11 @@
 #include <freertos/task.h>
 #include <freertos/queue.h>
 #include <freertos/semphr.h>
+#if CONFIG_IDF_TARGET_ESP32S3
+#include <esp32s3/rom/miniz.h>
+#else
+#include <esp32/rom/miniz.h>
+#endif
 
 // Pin definitions for ESP32 S3 Feather
 #define EPD_CS    10  // D10 - Chip Select
@@ -67,6 +72,12 @@ unsigned int uploadBytesReceived = 0;
 bool uploadInProgress = false;
 bool newImagePending = false;
 
+// Compressed uploads (Content-Encoding: deflate) are inflated with the ROM's tinfl
+bool uploadCompressed = false;
+unsigned int uploadWireBytes = 0;
+tinfl_decompressor* inflater = nullptr;
+tinfl_status inflateStatus = TINFL_STATUS_NEEDS_MORE_INPUT;
+
 // === HARDWARE INTERFACE (DISPLAY CORE ONLY) ===
 void epd_digital_write(int pin, int value) { digitalWrite(pin, value); }
 int  epd_digital_read(int pin)              { return digitalRead(pin); }
@@ -370,35 +381,43 @@ void displayTask(void* parameter) {
 }
 
 // === HTTP HANDLERS (CORE 0) ===
+void frameUploadStart() {
+  uploadInProgress = true;
+  uploadBytesReceived = 0;
+  
+  // Make sure we have the shared buffer
+  if (!sharedImageBuffer) {
+    Serial.println("[HTTP] ERROR: No shared buffer allocated");
+    uploadInProgress = false;
+  }
+}
+
+void frameUploadWrite(const uint8_t* data, size_t len) {
+  if (uploadBytesReceived + len <= EPD_BUFFER_SIZE) {
+    // Lock buffer and write directly to shared memory
+    if (xSemaphoreTake(bufferMutex, pdMS_TO_TICKS(100)) == pdTRUE) {
+      memcpy(sharedImageBuffer + uploadBytesReceived, data, len);
+      uploadBytesReceived += len;
+      xSemaphoreGive(bufferMutex);
+    } else {
+      Serial.println("[HTTP] WARNING: Could not lock buffer for write");
+    }
+  } else {
+    Serial.printf("[HTTP] ERROR: Upload too large: %d + %d > %d\n", 
+                 uploadBytesReceived, len, EPD_BUFFER_SIZE);
+  }
+}
+
+// multipart/form-data body ("file" field)
 void handleFrameUploadBody() {
   HTTPUpload& upload = server.upload();
   
   if (upload.status == UPLOAD_FILE_START) {
     Serial.printf("[HTTP] Upload started, filename: %s\n", upload.filename.c_str());
-    uploadInProgress = true;
-    uploadBytesReceived = 0;
-    
-    // Make sure we have the shared buffer
-    if (!sharedImageBuffer) {
-      Serial.println("[HTTP] ERROR: No shared buffer allocated");
-      uploadInProgress = false;
-      return;
-    }
+    frameUploadStart();
   }
   else if (upload.status == UPLOAD_FILE_WRITE) {
-    if (uploadBytesReceived + upload.currentSize <= EPD_BUFFER_SIZE) {
-      // Lock buffer and write directly to shared memory
-      if (xSemaphoreTake(bufferMutex, pdMS_TO_TICKS(100)) == pdTRUE) {
-        memcpy(sharedImageBuffer + uploadBytesReceived, upload.buf, upload.currentSize);
-        uploadBytesReceived += upload.currentSize;
-        xSemaphoreGive(bufferMutex);
-      } else {
-        Serial.println("[HTTP] WARNING: Could not lock buffer for write");
-      }
-    } else {
-      Serial.printf("[HTTP] ERROR: Upload too large: %d + %d > %d\n", 
-                   uploadBytesReceived, upload.currentSize, EPD_BUFFER_SIZE);
-    }
+    frameUploadWrite(upload.buf, upload.currentSize);
   }
   else if (upload.status == UPLOAD_FILE_END) {
     uploadInProgress = false;
@@ -411,6 +430,89 @@ void handleFrameUploadBody() {
   }
 }
 
+// Inflate a chunk of a zlib stream straight into the shared buffer
+void frameUploadInflate(const uint8_t* data, size_t len) {
+  if (xSemaphoreTake(bufferMutex, pdMS_TO_TICKS(100)) != pdTRUE) {
+    Serial.println("[HTTP] WARNING: Could not lock buffer for write");
+    return;
+  }
+  
+  while (len > 0 && inflateStatus == TINFL_STATUS_NEEDS_MORE_INPUT) {
+    size_t inBytes = len;
+    size_t outBytes = EPD_BUFFER_SIZE - uploadBytesReceived;
+    inflateStatus = tinfl_decompress(inflater, data, &inBytes,
+                                     sharedImageBuffer, sharedImageBuffer + uploadBytesReceived, &outBytes,
+                                     TINFL_FLAG_PARSE_ZLIB_HEADER | TINFL_FLAG_HAS_MORE_INPUT |
+                                     TINFL_FLAG_USING_NON_WRAPPING_OUTPUT_BUF);
+    data += inBytes;
+    len -= inBytes;
+    uploadBytesReceived += outBytes;
+  }
+  
+  xSemaphoreGive(bufferMutex);
+  
+  if (inflateStatus == TINFL_STATUS_HAS_MORE_OUTPUT) {
+    Serial.printf("[HTTP] ERROR: Inflated upload larger than %d bytes\n", EPD_BUFFER_SIZE);
+  } else if (inflateStatus < TINFL_STATUS_DONE) {
+    Serial.printf("[HTTP] ERROR: Inflate failed (%d)\n", inflateStatus);
+  }
+}
+
+void frameUploadInflateEnd() {
+  if (inflater) {
+    free(inflater);
+    inflater = nullptr;
+  }
+  uploadCompressed = false;
+}
+
+// application/octet-stream body - no MIME framing to parse
+void handleFrameRawBody() {
+  HTTPRaw& raw = server.raw();
+  
+  if (raw.status == RAW_START) {
+    frameUploadStart();
+    uploadWireBytes = 0;
+    uploadCompressed = server.header("Content-Encoding") == "deflate";
+    if (uploadCompressed) {
+      inflater = (tinfl_decompressor*)malloc(sizeof(tinfl_decompressor));
+      if (!inflater) {
+        Serial.println("[HTTP] ERROR: Could not allocate inflater");
+        uploadInProgress = false;
+        uploadCompressed = false;
+        return;
+      }
+      tinfl_init(inflater);
+      inflateStatus = TINFL_STATUS_NEEDS_MORE_INPUT;
+    }
+    Serial.printf("[HTTP] Raw upload started%s\n", uploadCompressed ? " (deflate)" : "");
+  }
+  else if (raw.status == RAW_WRITE) {
+    if (!uploadInProgress) return;  // Start failed - drop the body
+    uploadWireBytes += raw.currentSize;
+    if (uploadCompressed) {
+      frameUploadInflate(raw.buf, raw.currentSize);
+    } else {
+      frameUploadWrite(raw.buf, raw.currentSize);
+    }
+  }
+  else if (raw.status == RAW_END) {
+    uploadInProgress = false;
+    if (uploadCompressed && inflateStatus != TINFL_STATUS_DONE) {
+      Serial.println("[HTTP] ERROR: Compressed upload did not inflate to a complete frame");
+      uploadBytesReceived = 0;
+    }
+    Serial.printf("[HTTP] Raw upload complete: %d bytes (%d on the wire)\n", uploadBytesReceived, uploadWireBytes);
+    frameUploadInflateEnd();
+  }
+  else if (raw.status == RAW_ABORTED) {
+    uploadInProgress = false;
+    uploadBytesReceived = 0;
+    frameUploadInflateEnd();
+    Serial.println("[HTTP] Raw upload aborted");
+  }
+}
+
 void handleFrameUpload() {
   if (uploadInProgress) {
     server.send(500, "application/json", "{\"error\":\"Upload in progress\"}");
@@ -483,6 +585,9 @@ void handleStatus() {
   doc["http_core"] = 0;
   doc["display_core"] = 1;
   doc["shared_buffer"] = sharedImageBuffer != nullptr;
+  doc["raw_upload"] = true;  // POST /api/display/raw is available
+  JsonArray encodings = doc.createNestedArray("content_encodings");
+  encodings.add("deflate");
   
   String resp;
   serializeJson(doc, resp);
@@ -542,10 +647,15 @@ void httpTask(void* parameter) {
   
   // Setup HTTP routes
   server.on("/api/display/frame", HTTP_POST, handleFrameUpload, handleFrameUploadBody);
+  server.on("/api/display/raw", HTTP_POST, handleFrameUpload, handleFrameRawBody);
   server.on("/api/status", HTTP_GET, handleStatus);
   server.on("/api/clear", HTTP_GET, handleClear);
   server.on("/api/test", HTTP_GET, handleTest);
   
+  // Needed by the raw upload handler to detect compressed bodies
+  const char* collectedHeaders[] = {"Content-Encoding"};
+  server.collectHeaders(collectedHeaders, 1);
+  
   server.begin();
   Serial.println("[HTTP] HTTP server running on port 80");
   
@@ -6,35 +6,282 @@ Clean working version with all features
 
 import os
 import sys
+import io
+import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from PIL import Image, ImageOps, ImageEnhance
+import zlib
+import numpy as np
+from PIL import Image, ImageOps, ImageStat
 import time
 import argparse
+import functools
+import importlib.util
+from types import MappingProxyType
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Default configuration
 DEFAULT_ESP32_IP = "10.168.1.166"
 DEFAULT_IMAGE_PATH = "photo.png"
-API_ENDPOINT = "/api/display/frame"
+API_ENDPOINT = "/api/display/raw"  # application/octet-stream body
+MULTIPART_ENDPOINT = "/api/display/frame"  # multipart form, for firmware without the raw route
 STATUS_ENDPOINT = "/api/status"
 TIMEOUT = 30  # seconds
+RETRIES = 2  # transparent retries for dropped WiFi connections and 502/503/504
+COMPRESS_LEVEL = 6  # zlib level for Content-Encoding: deflate uploads
+CACHE_VERSION = 11  # bump when the conversion output changes
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'jr_epaper')
+CACHE_MAX_FILES = 256  # least recently used frames beyond this are pruned (~48 MB at 192 KB each)
+SCAN_TIMEOUT = 2  # seconds per probed host
+SCAN_WORKERS = 32
+PIPELINE_DEPTH = 2  # converted frames buffered ahead of the upload
+DISPLAY_TIMEOUT = 90  # seconds to wait for the previous frame's refresh in a sequence
+DISPLAY_POLL_INTERVAL = 1.0  # seconds between /api/status polls while the display is busy
+
+# Resampling filters selectable with --filter
+RESAMPLE_FILTERS = {
+    'lanczos': Image.Resampling.LANCZOS,
+    'bicubic': Image.Resampling.BICUBIC,
+    'bilinear': Image.Resampling.BILINEAR,
+}
 
 # E6 display specifications
 EPD_WIDTH = 800
 EPD_HEIGHT = 480
 EPD_BUFFER_SIZE = 192000  # 4 bits per pixel (800 * 480 / 2)
 
+# E6 palette: (4-bit code, RGB)
+E6_PALETTE = (
+    (0x0, (0, 0, 0)),           # BLACK
+    (0x1, (255, 255, 255)),     # WHITE
+    (0x2, (255, 255, 0)),       # YELLOW
+    (0x3, (255, 0, 0)),         # RED
+    (0x4, (0, 0, 255)),         # BLUE
+    (0x5, (0, 255, 0)),         # GREEN
+)
+E6_COLOR_NAMES = MappingProxyType({0x0: "BLACK", 0x1: "WHITE", 0x2: "YELLOW", 0x3: "RED", 0x4: "BLUE", 0x5: "GREEN"})
+
+# Derived palette views, shared read-only by every conversion
+E6_CODES = np.array([code for code, _ in E6_PALETTE], dtype=np.uint8)
+E6_RGB = np.array([rgb for _, rgb in E6_PALETTE], dtype=np.float32)
+E6_CODE_TO_RGB = np.zeros((16, 3), dtype=np.uint8)
+E6_CODE_TO_RGB[E6_CODES] = E6_RGB
+E6_PIL_PALETTE = bytes(channel for _, rgb in E6_PALETTE for channel in rgb)
+for _view in (E6_CODES, E6_RGB, E6_CODE_TO_RGB):
+    _view.flags.writeable = False
+
+# Palette image holding exactly the E6 colors, so PIL's quantize indices are palette positions
+E6_PIL_PALETTE_IMG = Image.new('P', (1, 1))
+E6_PIL_PALETTE_IMG.putpalette(E6_PIL_PALETTE)
+
+LINEAR_SCALE = 16  # fixed-point linear light: 0-255 scaled to 0-4080 (12 bits) in int16
+
+def _build_srgb_to_linear():
+    """sRGB byte -> linear-light intensity in LINEAR_SCALE fixed point (int16)"""
+    c = np.arange(256, dtype=np.float64) / 255
+    linear = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    table = np.rint(linear * 255 * LINEAR_SCALE).astype(np.int16)
+    table.flags.writeable = False
+    return table
+
+# Error diffusion runs in linear light so dithered areas keep their brightness.
+# The E6 primaries are all 0 or 255 per channel, so the palette is the same in both spaces.
+SRGB_TO_LINEAR = _build_srgb_to_linear()
+E6_LINEAR = E6_RGB.astype(np.int32) * LINEAR_SCALE
+E6_LINEAR.flags.writeable = False
+
+def _build_test_pattern():
+    """One solid 80-row band per color, both nibbles of each byte set to the band color"""
+    band_bytes = (E6_CODES << 4) | E6_CODES
+    row_bytes = band_bytes[np.minimum(np.arange(EPD_HEIGHT) // 80, len(E6_CODES) - 1)]
+    return np.broadcast_to(row_bytes[:, None], (EPD_HEIGHT, EPD_WIDTH // 2)).tobytes()
+
+TEST_PATTERN = _build_test_pattern()  # packed frame, never changes
+
+def _build_bayer_offsets():
+    """8x8 Bayer thresholds tiled over the frame, centred and spread across the full 0-255 palette gap"""
+    bayer = np.zeros((1, 1), dtype=np.int32)
+    for _ in range(3):
+        bayer = np.block([[4 * bayer, 4 * bayer + 2], [4 * bayer + 3, 4 * bayer + 1]])
+    offsets = np.round(((bayer + 0.5) / 64 - 0.5) * 255).astype(np.int16)
+    tiled = np.tile(offsets, (EPD_HEIGHT // 8, EPD_WIDTH // 8))[:, :, None]  # broadcast over RGB
+    tiled.flags.writeable = False
+    return tiled
+
+BAYER_OFFSETS = _build_bayer_offsets()
+
+def _fs_dither_kernel(img, palette):
+    """Serpentine Floyd-Steinberg over an int16 (H, W, 3) fixed-point buffer, modified in place; returns palette indices"""
+    height, width, _ = img.shape
+    indices = np.empty((height, width), dtype=np.uint8)
+    full_scale = 255 * LINEAR_SCALE
+    
+    for y in range(height):
+        # Alternate scan direction each row so error doesn't streak to the right
+        if y % 2 == 0:
+            start, stop, step = 0, width, 1
+        else:
+            start, stop, step = width - 1, -1, -1
+        
+        for x in range(start, stop, step):
+            # Clamp accumulated error to the displayable range so saturated areas don't bleed
+            for c in range(3):
+                if img[y, x, c] < 0:
+                    img[y, x, c] = 0
+                elif img[y, x, c] > full_scale:
+                    img[y, x, c] = full_scale
+            
+            # Closest palette color (squared Euclidean distance), pixel held in registers
+            r = np.int32(img[y, x, 0])
+            g = np.int32(img[y, x, 1])
+            b = np.int32(img[y, x, 2])
+            best = 0
+            best_dist = np.int64(1) << 62
+            for k in range(palette.shape[0]):
+                dr = np.int64(r - palette[k, 0])
+                dg = np.int64(g - palette[k, 1])
+                db = np.int64(b - palette[k, 2])
+                dist = dr * dr + dg * dg + db * db
+                if dist < best_dist:
+                    best_dist = dist
+                    best = k
+            indices[y, x] = best
+            
+            # Distribute error (Floyd-Steinberg pattern, mirrored on reverse rows), rounded sixteenths
+            ahead = x + step
+            behind = x - step
+            for c in range(3):
+                err = np.int32(img[y, x, c]) - palette[best, c]
+                if 0 <= ahead < width:
+                    img[y, ahead, c] += (err * 7 + 8) >> 4
+                if y + 1 < height:
+                    if 0 <= behind < width:
+                        img[y + 1, behind, c] += (err * 3 + 8) >> 4
+                    img[y + 1, x, c] += (err * 5 + 8) >> 4
+                    if 0 <= ahead < width:
+                        img[y + 1, ahead, c] += (err + 8) >> 4
+    
+    return indices
+
+@functools.lru_cache(maxsize=None)
+def _compiled_fs_kernel():
+    """JIT-compile the dither kernel on first use (Numba costs ~0.25 s to import), or None without Numba"""
+    try:
+        from numba import njit
+    except ImportError:  # Numba is optional - quality dithering falls back to Pillow's quantizer
+        return None
+    return njit(cache=True, fastmath=True)(_fs_dither_kernel)
+
+def find_esp32_ip(network_base, port=80):
+    """Probe every host of a /24 subnet in parallel for the e-paper status endpoint"""
+    candidates = [f"{network_base}{i}" for i in range(1, 255)]
+    print(f"🔍 Scanning {network_base}1-254 for the ESP32 e-paper display...")
+    
+    def probe(ip):
+        try:
+            response = requests.get(f"http://{ip}:{port}{STATUS_ENDPOINT}", timeout=SCAN_TIMEOUT)
+            data = response.json() if response.status_code == 200 else None
+            # Other devices on the subnet may answer with any JSON shape
+            if isinstance(data, dict) and 'epaper' in str(data.get('service', '')).lower():
+                return ip
+        except (requests.RequestException, ValueError):
+            pass
+        return None
+    
+    executor = ThreadPoolExecutor(max_workers=SCAN_WORKERS)
+    try:
+        for future in as_completed([executor.submit(probe, ip) for ip in candidates]):
+            ip = future.result()
+            if ip:
+                print(f"✅ Found ESP32 at {ip}")
+                return ip
+    finally:
+        # Don't wait for the remaining probes to time out
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    print(f"❌ No ESP32 e-paper display found on {network_base}0/24")
+    return None
+
+def enhancement_matrix(contrast, saturation, brightness, mean):
+    """Express ImageEnhance Contrast -> Color -> Brightness (before clipping) as an RGB convert() matrix"""
+    luma = (0.299, 0.587, 0.114)  # weights of Pillow's RGB -> L conversion
+    matrix = []
+    for row in range(3):
+        # Saturation blends toward luma; it leaves the uniform gray contrast offset unchanged
+        gains = [saturation * (row == col) + (1 - saturation) * luma[col] for col in range(3)]
+        matrix += [brightness * contrast * gain for gain in gains]
+        matrix.append(brightness * (1 - contrast) * mean)
+    return tuple(matrix)
+
+@functools.lru_cache(maxsize=None)
+def build_palette_lut(palette):
+    """Map every RGB555 key (r5 << 10 | g5 << 5 | b5) to its nearest palette code (luma-weighted distance)"""
+    levels = np.arange(4, 256, 8, dtype=np.int32)  # bin centres
+    grid = np.stack(np.meshgrid(levels, levels, levels, indexing='ij'), axis=-1)
+    palette_rgb = np.array([rgb for _, rgb in palette], dtype=np.int32)
+    palette_codes = np.array([code for code, _ in palette], dtype=np.uint8)
+    
+    # Integer luma weights (x1000): exact, and at most ~6.5e7 so int32 never overflows
+    diff = grid[:, :, :, None, :] - palette_rgb
+    distance = (diff * diff) @ np.array([299, 587, 114], dtype=np.int32)
+    lut = palette_codes[distance.argmin(axis=-1)].ravel()  # 32 KB, indexed by 15-bit key
+    lut.flags.writeable = False  # cached and shared across senders
+    return lut
+
+class _ThreadOutput:
+    """sys.stdout stand-in that lets a worker thread collect its prints instead of interleaving them"""
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (self.stream if buffer is None else buffer).write(text)
+    
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
 class EPaperImageSender:
-    def __init__(self, esp32_ip, port=80):
+    def __init__(self, esp32_ip, port=80, allow_compress=True):
         self.esp32_ip = esp32_ip
         self.port = port
         self.base_url = f"http://{esp32_ip}:{port}"
         
+        # One session (headers, retries, connection pool) shared by the status check and the uploads
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'EPaper-ImageSender/1.0'})
+        # POST is retried too: an upload overwrites the whole frame buffer, so repeating it is safe
+        retry = Retry(total=RETRIES, backoff_factor=0.2, status_forcelist=[502, 503, 504],
+                      allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {'POST'}, raise_on_status=False)
+        self.session.mount('http://', HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=2))
+        
+        # Set by check_connection() from the upload features the firmware advertises
+        self.allow_compress = allow_compress
+        self.compress = False
+        self.raw_upload = False
+        
+        # Nearest-color lookup, built once per process and shared by every sender
+        self.palette_lut = build_palette_lut(E6_PALETTE)
+        
+    def close(self):
+        """Close the session and its pooled connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
     def check_connection(self):
         """Check if ESP32 is reachable"""
         try:
             print(f"🔍 Checking connection to {self.base_url}...")
-            response = requests.get(f"{self.base_url}{STATUS_ENDPOINT}", timeout=5)
+            response = self.session.get(f"{self.base_url}{STATUS_ENDPOINT}", timeout=5)
             if response.status_code == 200:
                 status_data = response.json()
                 print(f"✅ Connected to ESP32!")
@@ -43,6 +290,16 @@ class EPaperImageSender:
                 print(f"   Display Ready: {status_data.get('display_initialized', False)}")
                 print(f"   Buffer Size: {status_data.get('buffer_size', 'Unknown')} bytes")
                 print(f"   Free Heap: {status_data.get('free_heap', 'Unknown')} bytes")
+                encodings = status_data.get('content_encodings', [])
+                # Firmware that predates the raw route only accepts multipart uploads
+                self.raw_upload = bool(status_data.get('raw_upload', 'deflate' in encodings))
+                print(f"   Upload Format: {'raw' if self.raw_upload else 'multipart (older firmware)'}")
+                supported = self.raw_upload and 'deflate' in encodings
+                self.compress = supported and self.allow_compress
+                if self.compress:
+                    print(f"   Compressed Upload: deflate")
+                else:
+                    print(f"   Compressed Upload: {'disabled' if supported else 'not supported'}")
                 return True
             else:
                 print(f"❌ ESP32 responded with status {response.status_code}")
@@ -52,7 +309,8 @@ class EPaperImageSender:
             return False
     
     def convert_image_for_epaper(self, image_path, resize_mode='fit', dither_mode='none', 
-                                contrast=1.0, saturation=1.0, debug=False):
+                                contrast=1.0, saturation=1.0, debug=False, resample='bicubic',
+                                use_cache=True):
         """Convert image to E6 e-paper format with optional dithering and enhancements"""
         try:
             print(f"🖼️  Processing image: {image_path}")
@@ -61,6 +319,16 @@ class EPaperImageSender:
                 print(f"❌ Image file not found: {image_path}")
                 return None
             
+            # Debug runs always reprocess so the intermediate images get written
+            cache_path = None
+            if use_cache and not debug:
+                cache_path = self.get_cache_path(image_path, resize_mode, dither_mode,
+                                                 contrast, saturation, resample)
+                cached = self.read_cache(cache_path)
+                if cached:
+                    print(f"   ⚡ Using cached conversion: {cache_path}")
+                    return cached
+            
             # Open and process image
             with Image.open(image_path) as img:
                 print(f"   Original size: {img.size} ({img.width}x{img.height})")
@@ -69,37 +337,38 @@ class EPaperImageSender:
                 print(f"   Dithering: {dither_mode}")
                 print(f"   Contrast: {contrast:.1f}x, Saturation: {saturation:.1f}x")
                 
+                # Let libjpeg decode large JPEGs at 1/2, 1/4 or 1/8 scale (no-op for other formats)
+                original_size = img.size
+                img.draft('RGB', (EPD_WIDTH, EPD_HEIGHT))
+                if img.size != original_size:
+                    print(f"   JPEG draft decode: {img.size}")
+                
+                # The 6-color quantizer erases any difference LANCZOS makes over BICUBIC
+                resample_filter = RESAMPLE_FILTERS[resample]
+                print(f"   Resample filter: {resample}")
+                
                 # Convert to RGB if needed
                 if img.mode != 'RGB':
                     img = img.convert('RGB')
                 
+                # Cheap integer box reduction first, so the filter only handles the last <2x step
+                scale = min(img.width // (2 * EPD_WIDTH), img.height // (2 * EPD_HEIGHT))
+                if scale > 1:
+                    img = img.reduce(scale)
+                    print(f"   Box-reduced {scale}x to: {img.size}")
+                
                 # Apply different resizing strategies
                 if resize_mode == 'stretch':
-                    resized_img = img.resize((EPD_WIDTH, EPD_HEIGHT), Image.Resampling.LANCZOS)
+                    resized_img = img.resize((EPD_WIDTH, EPD_HEIGHT), resample_filter)
                     print(f"   Stretched to: {resized_img.size}")
                     
                 elif resize_mode == 'fill':
-                    img_ratio = img.width / img.height
-                    display_ratio = EPD_WIDTH / EPD_HEIGHT
-                    print(f"   Image ratio: {img_ratio:.3f}, Display ratio: {display_ratio:.3f}")
-                    
-                    if img_ratio > display_ratio:
-                        new_height = EPD_HEIGHT
-                        new_width = int(new_height * img_ratio)
-                        temp_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                        left = (new_width - EPD_WIDTH) // 2
-                        resized_img = temp_img.crop((left, 0, left + EPD_WIDTH, EPD_HEIGHT))
-                        print(f"   Cropped from x={left} to x={left + EPD_WIDTH}")
-                    else:
-                        new_width = EPD_WIDTH
-                        new_height = int(new_width / img_ratio)
-                        temp_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                        top = (new_height - EPD_HEIGHT) // 2
-                        resized_img = temp_img.crop((0, top, EPD_WIDTH, top + EPD_HEIGHT))
-                        print(f"   Cropped from y={top} to y={top + EPD_HEIGHT}")
-                        
+                    # Crop to the display aspect first, then resample only the kept region
+                    resized_img = ImageOps.fit(img, (EPD_WIDTH, EPD_HEIGHT), resample_filter)
+                    print(f"   Cropped and resized to: {resized_img.size}")
+                
                 else:  # 'fit' mode (default)
-                    img.thumbnail((EPD_WIDTH, EPD_HEIGHT), Image.Resampling.LANCZOS)
+                    img.thumbnail((EPD_WIDTH, EPD_HEIGHT), resample_filter)
                     print(f"   Thumbnail size: {img.size}")
                     
                     resized_img = Image.new('RGB', (EPD_WIDTH, EPD_HEIGHT), 'white')
@@ -126,26 +395,18 @@ class EPaperImageSender:
                     enhanced_img.save(debug_path)
                     print(f"   Debug image saved: {debug_path}")
                 
-                # Define E6 palette
-                e6_palette = [
-                    (0x0, (0, 0, 0)),           # BLACK
-                    (0x1, (255, 255, 255)),     # WHITE  
-                    (0x2, (255, 255, 0)),       # YELLOW
-                    (0x3, (255, 0, 0)),         # RED
-                    (0x4, (0, 0, 255)),         # BLUE
-                    (0x5, (0, 255, 0))          # GREEN
-                ]
-                
-                # Apply quantization based on dither mode
+                # Quantize straight to an (H, W) array of E6 color codes
                 if dither_mode == 'fast':
-                    quantized_img = self.pil_dither_to_e6(enhanced_img, e6_palette, debug)
+                    codes = self.pil_dither_to_e6(enhanced_img, debug)
                 elif dither_mode == 'quality':
-                    quantized_img = self.floyd_steinberg_dither(enhanced_img, e6_palette, debug)
+                    codes = self.floyd_steinberg_dither(enhanced_img, debug)
+                elif dither_mode == 'bayer':
+                    codes = self.bayer_dither(enhanced_img, debug)
                 else:  # 'none'
-                    quantized_img = self.quantize_to_e6_palette(enhanced_img, e6_palette, debug)
+                    codes = self.quantize_to_e6_palette(enhanced_img, debug)
                 
                 # Convert to E6 format
-                raw_data = self.convert_to_e6_format(quantized_img, e6_palette)
+                raw_data = self.convert_to_e6_format(codes)
                 
                 print(f"   Raw data size: {len(raw_data)} bytes")
                 print(f"   Expected size: {EPD_BUFFER_SIZE} bytes")
@@ -158,6 +419,9 @@ class EPaperImageSender:
                     print(f"   First 16 bytes: {' '.join(f'{b:02X}' for b in raw_data[:16])}")
                     print(f"   Last 16 bytes:  {' '.join(f'{b:02X}' for b in raw_data[-16:])}")
                 
+                if cache_path:
+                    self.write_cache(cache_path, raw_data)
+                
                 return raw_data
                     
         except Exception as e:
@@ -166,346 +430,343 @@ class EPaperImageSender:
             traceback.print_exc()
             return None
 
+    def get_cache_path(self, image_path, resize_mode, dither_mode, contrast, saturation, resample):
+        """Cache file for this image file version and conversion settings"""
+        stat = os.stat(image_path)
+        # Quality dithering gives different frames with and without Numba (checked without importing it)
+        if dither_mode == 'quality':
+            backend = '+numba' if importlib.util.find_spec('numba') is not None else '+pil'
+        else:
+            backend = ''
+        key = (f"{CACHE_VERSION}|{os.path.abspath(image_path)}|{stat.st_mtime_ns}|{stat.st_size}|"
+               f"{EPD_WIDTH}x{EPD_HEIGHT}|{resize_mode}|{dither_mode}{backend}|{contrast}|{saturation}|{resample}")
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return os.path.join(CACHE_DIR, f"{digest}.bin")
+    
+    def read_cache(self, cache_path):
+        """Return cached E6 data, or None if missing or not a full frame"""
+        try:
+            with open(cache_path, 'rb') as f:
+                raw_data = f.read()
+        except OSError:
+            return None
+        if len(raw_data) != EPD_BUFFER_SIZE:
+            return None
+        # Refresh the mtime so pruning evicts the least recently used frames first
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return raw_data
+    
+    def write_cache(self, cache_path, raw_data):
+        """Store E6 data atomically so a concurrent reader never sees a partial file"""
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(raw_data)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"   ⚠️  Could not write conversion cache: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self.prune_cache()
+    
+    def prune_cache(self):
+        """Delete the least recently used cache files beyond CACHE_MAX_FILES"""
+        entries = []
+        try:
+            for entry in os.scandir(CACHE_DIR):
+                try:
+                    if entry.is_file():
+                        entries.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    pass  # Removed by a concurrent run while scanning
+        except OSError:
+            return
+        if len(entries) <= CACHE_MAX_FILES:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - CACHE_MAX_FILES]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Already removed by a concurrent run
+    
     def enhance_image(self, img, contrast=1.0, saturation=1.0, debug=False):
-        """Apply contrast and saturation adjustments"""
-        enhanced_img = img
+        """Apply contrast, then saturation and brightness, as two clipped color-matrix passes"""
+        # Contrast pivots on the mean gray level, exactly like ImageEnhance.Contrast
+        mean = int(ImageStat.Stat(img.convert('L')).mean[0] + 0.5) if contrast != 1.0 else 0
         
-        # Apply contrast adjustment
         if contrast != 1.0:
             print(f"      Adjusting contrast: {contrast:.1f}x")
-            contrast_enhancer = ImageEnhance.Contrast(enhanced_img)
-            enhanced_img = contrast_enhancer.enhance(contrast)
-            
-            if debug:
-                debug_path = f"debug_contrast_{contrast:.1f}.png"
-                enhanced_img.save(debug_path)
-                print(f"      Contrast debug image saved: {debug_path}")
-        
-        # Apply saturation adjustment
         if saturation != 1.0:
             print(f"      Adjusting saturation: {saturation:.1f}x")
-            saturation_enhancer = ImageEnhance.Color(enhanced_img)
-            enhanced_img = saturation_enhancer.enhance(saturation)
-            
-            if debug:
-                debug_path = f"debug_saturation_{saturation:.1f}.png"
-                enhanced_img.save(debug_path)
-                print(f"      Saturation debug image saved: {debug_path}")
         
         # Optional: Auto-adjust brightness for e-ink optimization
+        brightness = 1.0
         if contrast > 1.5 or saturation > 1.5:
             print(f"      Applying brightness optimization for e-ink...")
-            brightness_enhancer = ImageEnhance.Brightness(enhanced_img)
-            enhanced_img = brightness_enhancer.enhance(1.1)  # Slight brightness boost
-            
-            if debug:
+            brightness = 1.1  # Slight brightness boost
+        
+        # Clip after contrast like ImageEnhance does - saturation must see the clipped colors.
+        # A brightness gain >= 1 commutes with clipping, so it folds exactly into the saturation pass.
+        contrasted_img = img
+        if contrast != 1.0:
+            contrasted_img = img.convert('RGB', enhancement_matrix(contrast, 1.0, 1.0, mean))
+        enhanced_img = contrasted_img
+        if saturation != 1.0 or brightness != 1.0:
+            enhanced_img = contrasted_img.convert('RGB', enhancement_matrix(1.0, saturation, brightness, 0))
+        
+        if debug:
+            if contrast != 1.0:
+                debug_path = f"debug_contrast_{contrast:.1f}.png"
+                contrasted_img.save(debug_path)
+                print(f"      Contrast debug image saved: {debug_path}")
+            if saturation != 1.0:
+                debug_path = f"debug_saturation_{saturation:.1f}.png"
+                contrasted_img.convert('RGB', enhancement_matrix(1.0, saturation, 1.0, 0)).save(debug_path)
+                print(f"      Saturation debug image saved: {debug_path}")
+            if brightness != 1.0:
                 debug_path = f"debug_enhanced_final.png"
                 enhanced_img.save(debug_path)
                 print(f"      Final enhanced debug image saved: {debug_path}")
         
         return enhanced_img
 
-    def pil_dither_to_e6(self, img, palette, debug=False):
+    def pil_dither_to_e6(self, img, debug=False):
         """Use PIL's built-in dithering - FAST"""
         print("   🚀 Applying PIL dithering (fast method)...")
         
-        # Create a PIL palette image
-        palette_img = Image.new('P', (1, 1))
-        
-        # Flatten the palette for PIL format
-        pil_palette = []
-        for code, (r, g, b) in palette:
-            pil_palette.extend([r, g, b])
-        
-        # Pad palette to 256 colors (PIL requirement)
-        while len(pil_palette) < 768:  # 256 * 3
-            pil_palette.extend([0, 0, 0])
-        
-        palette_img.putpalette(pil_palette)
-        
         # Apply dithering using PIL's built-in Floyd-Steinberg
         print("      Converting and dithering...")
-        dithered = img.quantize(palette=palette_img, dither=Image.Dither.FLOYDSTEINBERG)
-        
-        # Convert back to RGB
-        quantized = dithered.convert('RGB')
-        
-        # Snap to exact palette colors (PIL might introduce variations)
-        width, height = quantized.size
-        pixels = quantized.load()
-        
-        for y in range(height):
-            for x in range(width):
-                rgb = pixels[x, y]
-                # Find closest exact match
-                min_dist = float('inf')
-                best_color = palette[0][1]
-                for code, target_rgb in palette:
-                    dist = sum((a - b) ** 2 for a, b in zip(rgb, target_rgb))
-                    if dist < min_dist:
-                        min_dist = dist
-                        best_color = target_rgb
-                pixels[x, y] = best_color
-        
-        # Count colors
-        color_counts = {color_code: 0 for color_code, _ in palette}
-        rgb_to_code = {rgb: code for code, rgb in palette}
-        
-        for y in range(height):
-            for x in range(width):
-                rgb = pixels[x, y]
-                code = rgb_to_code.get(rgb, 0x0)
-                color_counts[code] += 1
-        
-        # Print color distribution
-        total_pixels = width * height
-        print("   Color distribution (PIL dithering):")
-        color_names = {0x0: "BLACK", 0x1: "WHITE", 0x2: "YELLOW", 0x3: "RED", 0x4: "BLUE", 0x5: "GREEN"}
-        for code, count in color_counts.items():
-            percentage = (count / total_pixels) * 100
-            print(f"     {color_names.get(code, f'0x{code:X}')}: {count:6d} pixels ({percentage:5.1f}%)")
+        dithered = img.quantize(palette=E6_PIL_PALETTE_IMG, dither=Image.Dither.FLOYDSTEINBERG)
+        
+        codes = E6_CODES[np.asarray(dithered)]
         
         if debug:
+            self.print_color_distribution(codes, "PIL dithering")
             debug_path = f"debug_pil_dithered.png"
-            quantized.save(debug_path)
+            self.codes_to_image(codes).save(debug_path)
             print(f"   PIL dithered debug image saved: {debug_path}")
         
-        return quantized
+        return codes
 
-    def floyd_steinberg_dither(self, img, palette, debug=False):
-        """Working Floyd-Steinberg implementation - FIXED VERSION"""
-        print("   🎨 Applying Floyd-Steinberg dithering (working version)...")
-        
+    def floyd_steinberg_dither(self, img, debug=False):
+        """Floyd-Steinberg dithering - Numba kernel when available, else Pillow's C quantizer"""
         width, height = img.size
-        print(f"      Processing {width}x{height} = {width*height} pixels...")
-        
-        # Use PIL pixel access for reliability
-        pixels = img.load()
-        result = Image.new('RGB', (width, height))
-        result_pixels = result.load()
-        
-        # Create working copy as simple list of lists
-        working_data = []
-        for y in range(height):
-            row = []
-            for x in range(width):
-                r, g, b = pixels[x, y]
-                row.append([float(r), float(g), float(b)])
-            working_data.append(row)
-        
-        color_counts = {color_code: 0 for color_code, _ in palette}
+        
         start_time = time.time()
-        processed = 0
-        
-        for y in range(height):
-            # Progress every 25 rows
-            if y % 25 == 0:
-                elapsed = time.time() - start_time
-                progress = (y / height) * 100
-                pixels_per_sec = processed / max(elapsed, 0.1)
-                eta = (width * height - processed) / max(pixels_per_sec, 1)
-                print(f"      Row {y}/{height} ({progress:.1f}%) - {processed:,} pixels - ETA: {eta:.0f}s")
+        
+        kernel = _compiled_fs_kernel()
+        if kernel is not None:
+            print("   🎨 Applying Floyd-Steinberg dithering (Numba JIT kernel)...")
+            print(f"      Processing {width}x{height} = {width*height} pixels...")
             
-            for x in range(width):
-                # Get current pixel
-                old_r, old_g, old_b = working_data[y][x]
-                
-                # Find closest palette color
-                min_dist = float('inf')
-                best_color = palette[0][1]
-                best_code = palette[0][0]
-                
-                for color_code, (tr, tg, tb) in palette:
-                    dist = (old_r - tr)**2 + (old_g - tg)**2 + (old_b - tb)**2
-                    if dist < min_dist:
-                        min_dist = dist
-                        best_color = (tr, tg, tb)
-                        best_code = color_code
-                
-                # Set result pixel
-                result_pixels[x, y] = best_color
-                color_counts[best_code] += 1
-                processed += 1
-                
-                # Calculate error
-                err_r = old_r - best_color[0]
-                err_g = old_g - best_color[1]
-                err_b = old_b - best_color[2]
-                
-                # Distribute error (Floyd-Steinberg pattern)
-                if x + 1 < width:
-                    working_data[y][x + 1][0] += err_r * 7.0 / 16.0
-                    working_data[y][x + 1][1] += err_g * 7.0 / 16.0
-                    working_data[y][x + 1][2] += err_b * 7.0 / 16.0
-                
-                if y + 1 < height:
-                    if x > 0:
-                        working_data[y + 1][x - 1][0] += err_r * 3.0 / 16.0
-                        working_data[y + 1][x - 1][1] += err_g * 3.0 / 16.0
-                        working_data[y + 1][x - 1][2] += err_b * 3.0 / 16.0
-                    
-                    working_data[y + 1][x][0] += err_r * 5.0 / 16.0
-                    working_data[y + 1][x][1] += err_g * 5.0 / 16.0
-                    working_data[y + 1][x][2] += err_b * 5.0 / 16.0
-                    
-                    if x + 1 < width:
-                        working_data[y + 1][x + 1][0] += err_r * 1.0 / 16.0
-                        working_data[y + 1][x + 1][1] += err_g * 1.0 / 16.0
-                        working_data[y + 1][x + 1][2] += err_b * 1.0 / 16.0
-                
-                # Clamp values every 100 pixels to prevent overflow
-                if processed % 100 == 0:
-                    for dy in range(max(0, y), min(height, y + 2)):
-                        for dx in range(max(0, x - 1), min(width, x + 2)):
-                            if dy < len(working_data) and dx < len(working_data[dy]):
-                                working_data[dy][dx][0] = max(0.0, min(255.0, working_data[dy][dx][0]))
-                                working_data[dy][dx][1] = max(0.0, min(255.0, working_data[dy][dx][1]))
-                                working_data[dy][dx][2] = max(0.0, min(255.0, working_data[dy][dx][2]))
+            indices = kernel(SRGB_TO_LINEAR[np.asarray(img)], E6_LINEAR)
+        else:
+            print("   🎨 Applying Floyd-Steinberg dithering (Pillow C implementation)...")
+            print(f"      Processing {width}x{height} = {width*height} pixels...")
+            
+            linear = (SRGB_TO_LINEAR[np.asarray(img)] + LINEAR_SCALE // 2) // LINEAR_SCALE
+            linear_img = Image.fromarray(linear.astype(np.uint8), 'RGB')
+            indices = np.asarray(linear_img.quantize(palette=E6_PIL_PALETTE_IMG, dither=Image.Dither.FLOYDSTEINBERG))
         
         total_time = time.time() - start_time
-        print(f"      ✅ Completed {processed:,} pixels in {total_time:.1f} seconds ({processed/total_time:.0f} pixels/sec)")
+        print(f"      ✅ Completed {width*height:,} pixels in {total_time:.2f} seconds")
         
-        # Print color distribution
-        total_pixels = width * height
-        print("   Color distribution (Floyd-Steinberg):")
-        color_names = {0x0: "BLACK", 0x1: "WHITE", 0x2: "YELLOW", 0x3: "RED", 0x4: "BLUE", 0x5: "GREEN"}
-        for code, count in color_counts.items():
-            percentage = (count / total_pixels) * 100
-            print(f"     {color_names.get(code, f'0x{code:X}')}: {count:6d} pixels ({percentage:5.1f}%)")
+        codes = E6_CODES[indices]
         
         if debug:
+            self.print_color_distribution(codes, "Floyd-Steinberg")
             debug_path = f"debug_floyd_steinberg.png"
-            result.save(debug_path)
+            self.codes_to_image(codes).save(debug_path)
             print(f"   Floyd-Steinberg debug image saved: {debug_path}")
         
-        return result
+        return codes
 
-    def quantize_to_e6_palette(self, img, palette, debug=False):
-        """Simple nearest-color quantization - no dithering"""
+    def quantize_to_e6_palette(self, img, debug=False):
+        """Simple nearest-color quantization via the RGB lookup table - no dithering"""
         print("   🎨 Quantizing to E6 palette (no dithering)...")
         
-        width, height = img.size
-        pixels = img.load()
-        
-        quantized = Image.new('RGB', (width, height))
-        quantized_pixels = quantized.load()
+        codes = self.lookup_codes(np.asarray(img, dtype=np.uint8))
         
-        color_counts = {color_code: 0 for color_code, _ in palette}
+        if debug:
+            self.print_color_distribution(codes, "no dithering")
+            debug_path = f"debug_quantized.png"
+            self.codes_to_image(codes).save(debug_path)
+            print(f"   Quantized debug image saved: {debug_path}")
         
-        for y in range(height):
-            for x in range(width):
-                r, g, b = pixels[x, y]
-                
-                min_distance = float('inf')
-                best_color = palette[0][1]
-                best_code = palette[0][0]
-                
-                for color_code, rgb in palette:
-                    distance = (
-                        0.299 * (r - rgb[0]) ** 2 +
-                        0.587 * (g - rgb[1]) ** 2 +
-                        0.114 * (b - rgb[2]) ** 2
-                    ) ** 0.5
-                    
-                    if distance < min_distance:
-                        min_distance = distance
-                        best_color = rgb
-                        best_code = color_code
-                
-                quantized_pixels[x, y] = best_color
-                color_counts[best_code] += 1
+        return codes
+
+    def bayer_dither(self, img, debug=False):
+        """Ordered 8x8 Bayer dithering - every pixel independent, no error diffusion"""
+        print("   🔲 Applying Bayer ordered dithering...")
         
-        # Print color distribution
-        total_pixels = width * height
-        print("   Color distribution (no dithering):")
-        color_names = {0x0: "BLACK", 0x1: "WHITE", 0x2: "YELLOW", 0x3: "RED", 0x4: "BLUE", 0x5: "GREEN"}
-        for code, count in color_counts.items():
-            percentage = (count / total_pixels) * 100
-            print(f"     {color_names.get(code, f'0x{code:X}')}: {count:6d} pixels ({percentage:5.1f}%)")
+        biased = np.asarray(img, dtype=np.int16) + BAYER_OFFSETS
+        np.clip(biased, 0, 255, out=biased)
+        codes = self.lookup_codes(biased.astype(np.uint8))
         
         if debug:
-            debug_path = f"debug_quantized.png"
-            quantized.save(debug_path)
-            print(f"   Quantized debug image saved: {debug_path}")
+            self.print_color_distribution(codes, "Bayer")
+            debug_path = f"debug_bayer.png"
+            self.codes_to_image(codes).save(debug_path)
+            print(f"   Bayer dithered debug image saved: {debug_path}")
         
-        return quantized
+        return codes
+
+    def lookup_codes(self, rgb):
+        """Map a uint8 (H, W, 3) array to E6 codes through the RGB555 lookup table"""
+        bins = rgb >> 3
+        key = bins[:, :, 0].astype(np.uint16) << 10
+        key |= bins[:, :, 1].astype(np.uint16) << 5
+        key |= bins[:, :, 2]
+        return self.palette_lut.take(key)
+
+    def print_color_distribution(self, codes, label):
+        """Print per-color pixel counts of an E6 code array"""
+        counts = np.bincount(codes.ravel(), minlength=16)
+        total_pixels = codes.size
+        print(f"   Color distribution ({label}):")
+        for code, _ in E6_PALETTE:
+            percentage = (counts[code] / total_pixels) * 100
+            print(f"     {E6_COLOR_NAMES[code]}: {counts[code]:6d} pixels ({percentage:5.1f}%)")
+
+    def codes_to_image(self, codes):
+        """Render an E6 code array as an RGB image (debug output only)"""
+        return Image.fromarray(E6_CODE_TO_RGB[codes], 'RGB')
 
-    def convert_to_e6_format(self, img, palette):
-        """Convert quantized image to E6 4-bit format"""
+    def convert_to_e6_format(self, codes):
+        """Pack an (H, W) array of E6 color codes into the 4-bit frame format"""
         print("   Converting to E6 4-bit format...")
         
-        width, height = img.size
-        pixels = img.load()
+        height, width = codes.shape
         
         if width != EPD_WIDTH or height != EPD_HEIGHT:
             raise ValueError(f"Image must be exactly {EPD_WIDTH}x{EPD_HEIGHT}, got {width}x{height}")
         
-        raw_data = bytearray()
-        
-        rgb_to_code = {}
-        for color_code, rgb in palette:
-            rgb_to_code[rgb] = color_code
-        
-        bytes_written = 0
-        for y in range(height):
-            for x in range(0, width, 2):
-                r1, g1, b1 = pixels[x, y]
-                color1 = rgb_to_code.get((r1, g1, b1), 0x0)
-                
-                if x + 1 < width:
-                    r2, g2, b2 = pixels[x + 1, y]
-                    color2 = rgb_to_code.get((r2, g2, b2), 0x1)
-                else:
-                    color2 = 0x1
-                
-                byte_value = (color1 << 4) | color2
-                raw_data.append(byte_value)
-                bytes_written += 1
+        # Two pixels per byte, left pixel in the high nibble (OR in place - no extra temporary)
+        raw_data = codes[:, 0::2] << 4
+        raw_data |= codes[:, 1::2]
         
-        print(f"   Packed {bytes_written} bytes from {width}x{height} pixels")
+        print(f"   Packed {raw_data.size} bytes from {width}x{height} pixels")
         
         expected_bytes = (EPD_WIDTH * EPD_HEIGHT) // 2
-        if len(raw_data) != expected_bytes:
-            raise ValueError(f"Buffer size mismatch: expected {expected_bytes}, got {len(raw_data)}")
+        if raw_data.size != expected_bytes:
+            raise ValueError(f"Buffer size mismatch: expected {expected_bytes}, got {raw_data.size}")
         
-        return bytes(raw_data)
+        return raw_data.tobytes()
 
     def create_test_pattern(self):
         """Create E6 test pattern"""
         print("📊 Creating E6 test pattern...")
         
-        raw_data = bytearray()
-        colors = [0x0, 0x1, 0x2, 0x3, 0x4, 0x5]
-        
-        for y in range(EPD_HEIGHT):
-            color_index = min(y // 80, 5)
-            color = colors[color_index]
-            
-            for x in range(EPD_WIDTH // 2):
-                byte_value = (color << 4) | color
-                raw_data.append(byte_value)
+        raw_data = TEST_PATTERN
         
         print(f"   Test pattern size: {len(raw_data)} bytes")
-        return bytes(raw_data)
+        return raw_data
     
+    def wait_for_display(self, after=None):
+        """Poll /api/status until the display is idle and has refreshed since `after`; returns its last_update_time"""
+        deadline = time.time() + DISPLAY_TIMEOUT
+        waiting = False
+        while True:
+            try:
+                status = self.session.get(f"{self.base_url}{STATUS_ENDPOINT}", timeout=5).json()
+            except (requests.RequestException, ValueError):
+                status = None
+            if isinstance(status, dict):
+                last_update = status.get('last_update_time')
+                if not status.get('display_busy') and (after is None or last_update != after):
+                    return last_update
+            if time.time() > deadline:
+                print(f"⚠️  Display still busy after {DISPLAY_TIMEOUT} seconds, sending anyway")
+                return None
+            if not waiting:
+                print("⏳ Waiting for the display to finish refreshing...")
+                waiting = True
+            time.sleep(DISPLAY_POLL_INTERVAL)
+    
+    def send_sequence(self, image_paths, interval=0.0, **convert_options):
+        """Send several images, converting frame N+1 while frame N uploads"""
+        frames = queue.Queue(maxsize=PIPELINE_DEPTH)
+        output = _ThreadOutput(sys.stdout)
+        
+        def producer():
+            for path in image_paths:
+                # Collect the conversion log so it is printed with its frame, not mid-upload
+                output.local.buffer = io.StringIO()
+                image_data = self.convert_image_for_epaper(path, **convert_options)
+                frames.put((path, image_data, output.local.buffer.getvalue()))
+            frames.put(None)
+        
+        sys.stdout = output
+        try:
+            threading.Thread(target=producer, daemon=True).start()
+            
+            sent = 0
+            last_update = None
+            while True:
+                frame = frames.get()
+                if frame is None:
+                    break
+                path, image_data, log = frame
+                print(f"\n🖼️  Frame {sent + 1}/{len(image_paths)}: {path}")
+                print(log, end='')
+                if not image_data:
+                    print(f"❌ Failed to process image: {path}")
+                    return False
+                # The firmware drops upload data while the previous frame is pushed to the panel
+                last_update = self.wait_for_display(last_update)
+                if not self.send_image_data(image_data):
+                    return False
+                sent += 1
+                if interval > 0 and sent < len(image_paths):
+                    time.sleep(interval)
+        finally:
+            sys.stdout = output.stream
+        
+        return True
+
     def send_image_data(self, image_data):
         """Send raw image data to ESP32"""
         try:
+            endpoint = API_ENDPOINT if self.raw_upload else MULTIPART_ENDPOINT
             print(f"📡 Sending image data to ESP32...")
-            print(f"   Endpoint: {self.base_url}{API_ENDPOINT}")
+            print(f"   Endpoint: {self.base_url}{endpoint}")
             print(f"   Data size: {len(image_data)} bytes")
             
-            files = {
-                'file': ('image.bin', image_data, 'application/octet-stream')
-            }
+            body = image_data
+            headers = {'Content-Type': 'application/octet-stream'}
+            
+            # Flat color regions make the 4-bit buffer very compressible
+            if self.compress:
+                body = zlib.compress(image_data, COMPRESS_LEVEL)
+                headers['Content-Encoding'] = 'deflate'
+                print(f"   Compressed size: {len(body)} bytes ({len(image_data) / len(body):.1f}x, deflate)")
+            
+            headers['Content-Length'] = str(len(body))
             
             start_time = time.time()
             
-            response = requests.post(
-                f"{self.base_url}{API_ENDPOINT}",
-                files=files,
-                timeout=TIMEOUT
-            )
+            if self.raw_upload:
+                # Raw body straight from the buffer - no multipart envelope, no extra copy
+                response = self.session.post(
+                    f"{self.base_url}{endpoint}",
+                    data=memoryview(body),
+                    headers=headers,
+                    timeout=TIMEOUT
+                )
+            else:
+                response = self.session.post(
+                    f"{self.base_url}{endpoint}",
+                    files={'file': ('image.bin', image_data, 'application/octet-stream')},
+                    timeout=TIMEOUT
+                )
             
             elapsed_time = time.time() - start_time
             
@@ -546,16 +807,27 @@ class EPaperImageSender:
 def main():
     parser = argparse.ArgumentParser(description='Send image to ESP32 E6 E-Paper display')
     parser.add_argument('--ip', default=DEFAULT_ESP32_IP, help='ESP32 IP address')
-    parser.add_argument('--image', default=DEFAULT_IMAGE_PATH, help='Image file path')
+    parser.add_argument('--image', nargs='+', default=[DEFAULT_IMAGE_PATH],
+                       help='Image file path(s); several are sent in order as a frame sequence')
+    parser.add_argument('--interval', type=float, default=0.0, metavar='SECONDS',
+                       help='Extra delay between frames when sending several images (each frame already waits for the previous refresh)')
     parser.add_argument('--test', action='store_true', help='Send test pattern instead of image')
+    parser.add_argument('--scan', action='store_true',
+                       help='Scan the /24 subnet of --ip for the ESP32 instead of using --ip directly')
     parser.add_argument('--resize', choices=['fit', 'fill', 'stretch'], default='fit',
                        help='Resize mode: fit (maintain ratio), fill (crop to fill), stretch (may distort)')
-    parser.add_argument('--dither', choices=['fast', 'quality', 'none'], default='none',
-                       help='Dithering method: fast (PIL optimized), quality (Floyd-Steinberg), none (nearest color)')
+    parser.add_argument('--dither', choices=['fast', 'quality', 'bayer', 'none'], default='none',
+                       help='Dithering method: fast (PIL optimized), quality (Floyd-Steinberg), bayer (ordered 8x8), none (nearest color)')
+    parser.add_argument('--filter', choices=list(RESAMPLE_FILTERS), default='bicubic',
+                       help='Resample filter: bicubic (default), lanczos (sharpest, slowest), bilinear (fastest)')
     parser.add_argument('--contrast', type=float, default=1.0, metavar='FACTOR',
                        help='Contrast adjustment factor (1.0=normal, 1.5=50%% more contrast, 0.5=50%% less)')
     parser.add_argument('--saturation', type=float, default=1.0, metavar='FACTOR',
                        help='Saturation adjustment factor (1.0=normal, 1.5=50%% more vibrant, 0.0=grayscale)')
+    parser.add_argument('--no-compress', action='store_true',
+                       help='Send the raw frame even if the ESP32 accepts deflate-compressed uploads')
+    parser.add_argument('--no-cache', action='store_true',
+                       help=f'Always reprocess instead of reusing converted frames from {CACHE_DIR}')
     parser.add_argument('--debug', action='store_true', help='Save debug images and show detailed output')
     
     args = parser.parse_args()
@@ -571,30 +843,43 @@ def main():
     print(f"Buffer size: {EPD_BUFFER_SIZE} bytes")
     print()
     
-    sender = EPaperImageSender(args.ip)
-    
-    if not sender.check_connection():
-        print("\n💡 Troubleshooting tips:")
-        print("   1. Make sure ESP32 is powered on and connected to WiFi")
-        print("   2. Check that you're on the same network as the ESP32")
-        print("   3. Verify the IP address is correct")
-        print(f"   4. Try accessing http://{args.ip}/api/status in your web browser")
-        sys.exit(1)
-    
-    success = False
+    esp32_ip = args.ip
+    if args.scan:
+        esp32_ip = find_esp32_ip(args.ip.rsplit('.', 1)[0] + '.')
+        if not esp32_ip:
+            sys.exit(1)
     
-    if args.test:
-        print(f"\n🧪 Sending E6 test pattern...")
-        success = sender.send_test_pattern()
-    else:
-        print(f"\n🖼️  Processing image: {args.image}")
-        image_data = sender.convert_image_for_epaper(args.image, args.resize, args.dither, 
-                                                     args.contrast, args.saturation, args.debug)
-        if image_data:
-            success = sender.send_image_data(image_data)
-        else:
-            print(f"❌ Failed to process image: {args.image}")
+    with EPaperImageSender(esp32_ip, allow_compress=not args.no_compress) as sender:
+        if not sender.check_connection():
+            print("\n💡 Troubleshooting tips:")
+            print("   1. Make sure ESP32 is powered on and connected to WiFi")
+            print("   2. Check that you're on the same network as the ESP32")
+            print("   3. Verify the IP address is correct, or use --scan to search the subnet")
+            print(f"   4. Try accessing http://{esp32_ip}/api/status in your web browser")
             sys.exit(1)
+        
+        success = False
+        
+        if args.test:
+            print(f"\n🧪 Sending E6 test pattern...")
+            success = sender.send_test_pattern()
+        elif len(args.image) > 1:
+            print(f"\n🎞️  Sending {len(args.image)} frames...")
+            success = sender.send_sequence(args.image, args.interval, resize_mode=args.resize,
+                                           dither_mode=args.dither, contrast=args.contrast,
+                                           saturation=args.saturation, debug=args.debug,
+                                           resample=args.filter, use_cache=not args.no_cache)
+        else:
+            image_path = args.image[0]
+            print(f"\n🖼️  Processing image: {image_path}")
+            image_data = sender.convert_image_for_epaper(image_path, args.resize, args.dither, 
+                                                         args.contrast, args.saturation, args.debug,
+                                                         args.filter, not args.no_cache)
+            if image_data:
+                success = sender.send_image_data(image_data)
+            else:
+                print(f"❌ Failed to process image: {image_path}")
+                sys.exit(1)
     
     print("\n" + "=" * 60)
     if success: